@@ -28,9 +28,18 @@ GUI_STYLE = "Fusion"
 LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 LOG_LEVEL = logging.DEBUG
 
+_CONFIGURED = False
+
 
 def setup_logging():
-    """Set up logging configuration for the application."""
+    """Set up logging configuration for the application.
+
+    Repeated calls are no-ops once logging has been configured.
+    """
+    global _CONFIGURED
+    if _CONFIGURED:
+        return
+
     if not logging.getLogger().handlers:
         logging.basicConfig(
             level=LOG_LEVEL,
@@ -41,6 +50,10 @@ def setup_logging():
     logging.getLogger().setLevel(LOG_LEVEL)
 
     # Ensure all nd2_utils loggers are at debug level
-    for logger_name in logging.Logger.manager.loggerDict:
-        if "nd2_utils" in logger_name:
-            logging.getLogger(logger_name).setLevel(LOG_LEVEL)
+    names = [
+        name for name in logging.Logger.manager.loggerDict if name.startswith("nd2_utils")
+    ]
+    for logger_name in names:
+        logging.getLogger(logger_name).setLevel(LOG_LEVEL)
+
+    _CONFIGURED = True
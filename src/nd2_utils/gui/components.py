@@ -2,6 +2,8 @@
 Reusable GUI components for ND2 viewer.
 """
 
+from itertools import islice
+
 from PySide6.QtWidgets import (
     QGroupBox, QVBoxLayout, QHBoxLayout, QGridLayout,
     QPushButton, QLabel, QLineEdit, QTextEdit, QFileDialog,
@@ -11,6 +13,9 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Signal
 from PySide6.QtGui import QFont
 
+from ..utils.dimensions import DimensionParser
+from ..utils.ranges import parse_range
+
 
 class FileSelectionWidget(QGroupBox):
     """Widget for ND2 file selection."""
@@ -102,96 +107,65 @@ class DimensionSelectionWidget(QGroupBox):
         layout.addWidget(self.z_check, 4, 0)
         layout.addWidget(self.z_input, 4, 1, 1, 2)
         
-        # Connect signals
-        self.position_check.toggled.connect(self._on_position_check_toggled)
-        self.channel_check.toggled.connect(self._on_channel_check_toggled)
-        self.time_check.toggled.connect(self._on_time_check_toggled)
-        self.z_check.toggled.connect(self._on_z_check_toggled)
-    
-    def _on_position_check_toggled(self, checked):
-        self.position_input.setEnabled(checked)
-    
-    def _on_channel_check_toggled(self, checked):
-        self.channel_input.setEnabled(checked)
-    
-    def _on_time_check_toggled(self, checked):
-        self.time_input.setEnabled(checked)
-    
-    def _on_z_check_toggled(self, checked):
-        self.z_input.setEnabled(checked)
-    
-    def _parse_range(self, text):
-        """Parse a range string like '0' or '0-1' into (start, end) tuple."""
-        text = text.strip()
-        if not text:
-            return None, None
+        self._widgets = (
+            ('P', self.position_check, self.position_input),
+            ('C', self.channel_check, self.channel_input),
+            ('T', self.time_check, self.time_input),
+            ('Z', self.z_check, self.z_input),
+        )
+        self._last_dims_key = None
         
-        if '-' in text:
-            parts = text.split('-')
-            if len(parts) == 2:
-                try:
-                    start = int(parts[0].strip())
-                    end = int(parts[1].strip())
-                    return start, end
-                except ValueError:
-                    pass
-        else:
-            try:
-                value = int(text)
-                return value, value
-            except ValueError:
-                pass
+        self._check_to_input = {check: line_edit for _, check, line_edit in self._widgets}
         
-        return None, None
+        # Connect signals
+        for _, check, _ in self._widgets:
+            check.toggled.connect(self._on_check_toggled)
+    
+    def _on_check_toggled(self, checked):
+        self._check_to_input[self.sender()].setEnabled(checked)
     
     def set_dimensions(self, dimensions):
         """Update dimension ranges and visibility."""
-        # Reset all controls
-        self.position_check.setChecked(False)
-        self.position_check.setEnabled(False)
-        self.position_input.clear()
-        
-        self.channel_check.setChecked(False)
-        self.channel_check.setEnabled(False)
-        self.channel_input.clear()
-        
-        self.time_check.setChecked(False)
-        self.time_check.setEnabled(False)
-        self.time_input.clear()
-        
-        self.z_check.setChecked(False)
-        self.z_check.setEnabled(False)
-        self.z_input.clear()
-        
-        # Update based on available dimensions
-        if 'P' in dimensions:
-            size = dimensions['P']['size']
-            self.position_check.setEnabled(True)
-            self.position_input.setPlaceholderText(f"e.g., 0 or 0-{size-1}")
-        
-        if 'C' in dimensions:
-            size = dimensions['C']['size']
-            self.channel_check.setEnabled(True)
-            self.channel_input.setPlaceholderText(f"e.g., 0 or 0-{size-1}")
-        
-        if 'T' in dimensions:
-            size = dimensions['T']['size']
-            self.time_check.setEnabled(True)
-            self.time_input.setPlaceholderText(f"e.g., 0 or 0-{size-1}")
-        
-        if 'Z' in dimensions:
-            size = dimensions['Z']['size']
-            self.z_check.setEnabled(True)
-            self.z_input.setPlaceholderText(f"e.g., 0 or 0-{size-1}")
+        # Skip all Qt calls when the dimension layout has not changed
+        key = tuple(sorted((axis, info['size']) for axis, info in dimensions.items()))
+        if key == self._last_dims_key:
+            return
+        self._last_dims_key = key
+
+        for axis, check, line_edit in self._widgets:
+            # Reset controls
+            check.setChecked(False)
+            line_edit.clear()
+
+            # Update based on available dimensions
+            if axis in dimensions:
+                size = dimensions[axis]['size']
+                check.setEnabled(True)
+                line_edit.setPlaceholderText(f"e.g., 0 or 0-{size-1}")
+            else:
+                check.setEnabled(False)
     
     def get_selection(self):
-        """Get current dimension selection."""
+        """Get current dimension selection.
+
+        Raises:
+            ValueError: If a checked axis has text that is not a valid range
+        """
         return {
-            'position': self._parse_range(self.position_input.text()) if self.position_check.isChecked() else None,
-            'channel': self._parse_range(self.channel_input.text()) if self.channel_check.isChecked() else None,
-            'time': self._parse_range(self.time_input.text()) if self.time_check.isChecked() else None,
-            'z': self._parse_range(self.z_input.text()) if self.z_check.isChecked() else None,
+            'position': self._parse_input("Position", self.position_check, self.position_input),
+            'channel': self._parse_input("Channel", self.channel_check, self.channel_input),
+            'time': self._parse_input("Time", self.time_check, self.time_input),
+            'z': self._parse_input("Z", self.z_check, self.z_input),
         }
+    
+    @staticmethod
+    def _parse_input(name, check, line_edit):
+        if not check.isChecked():
+            return None
+        try:
+            return parse_range(line_edit.text())
+        except ValueError as e:
+            raise ValueError(f"{name}: {e}") from e
 
 
 class OutputSelectionWidget(QGroupBox):
@@ -242,39 +216,47 @@ class FileInfoWidget(QTextEdit):
         """Clear the content."""
         super().clear()
         self.setText("No file loaded")
+        self._last_info_key = None
     
     def set_file_info(self, info):
         """Display file information."""
-        lines = []
-        lines.append("=== ND2 File Information ===")
-        lines.append(f"Path: {info['path']}")
-        lines.append(f"Legacy format: {info['is_legacy']}")
-        lines.append("")
-        
-        lines.append("=== Dimensions ===")
-        lines.append(f"Shape: {info['shape']}")
-        lines.append(f"Size: {info['size']} samples")
-        lines.append(f"Data type: {info['dtype']}")
-        lines.append(f"Axes: {info['axes']}")
-        lines.append("")
-        
+        # Skip re-rendering (and Qt re-layout) when the same file is shown again
+        key = (info['path'], info['size'], tuple(info['axes']))
+        if key == self._last_info_key:
+            return
+        self._last_info_key = key
+
+        header = (
+            "=== ND2 File Information ===\n"
+            f"Path: {info['path']}\n"
+            f"Legacy format: {info['is_legacy']}\n"
+        )
+
+        dims_block = (
+            "=== Dimensions ===\n"
+            f"Shape: {info['shape']}\n"
+            f"Size: {info['size']} samples\n"
+            f"Data type: {info['dtype']}\n"
+            f"Axes: {info['axes']}\n"
+        )
+
         # Add dimension details
-        from ..utils.dimensions import DimensionParser
-        lines.append(DimensionParser.get_dimension_info_text(info['dimensions']))
-        
-        lines.append("=== Pixel Size ===")
-        pixel_size = info['pixel_size']
-        for key, value in pixel_size.items():
-            lines.append(f"{key}: {value}")
-        lines.append("")
-        
-        lines.append("=== Attributes ===")
-        for key, value in list(info['attributes'].items())[:10]:
-            lines.append(f"{key}: {value}")
-        if len(info['attributes']) > 10:
-            lines.append("... (truncated)")
-        
-        self.setText('\n'.join(lines))
+        details_block = DimensionParser.get_dimension_info_text(info['dimensions'])
+
+        pixel_block = "\n".join(
+            ("=== Pixel Size ===",
+             *(f"{key}: {value}" for key, value in info['pixel_size'].items()),
+             "")
+        )
+
+        attributes = info['attributes']
+        attrs_lines = [f"{key}: {value}" for key, value in islice(attributes.items(), 10)]
+        if len(attributes) > 10:
+            attrs_lines.append("... (truncated)")
+        attrs_block = "\n".join(("=== Attributes ===", *attrs_lines))
+
+        # setPlainText skips Qt's rich-text detection that setText performs
+        self.setPlainText("\n".join((header, dims_block, details_block, pixel_block, attrs_block)))
 
 
 class ExportButtonWidget(QWidget):
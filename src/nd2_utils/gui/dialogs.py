@@ -3,6 +3,7 @@ Custom dialog widgets for the ND2 viewer GUI.
 """
 
 import logging
+import math
 from typing import Dict, Any
 
 from PySide6.QtWidgets import (
@@ -12,6 +13,21 @@ from PySide6.QtWidgets import (
 
 logger = logging.getLogger(__name__)
 
+# (threshold, unit) pairs for file size formatting, largest first
+_SIZE_UNITS = ((1 << 30, "GB"), (1 << 20, "MB"), (1 << 10, "KB"))
+
+# Selectable axes and the full output axis order
+_CORE_AXES = ('T', 'P', 'C', 'Z')
+_ALL_AXES = _CORE_AXES + ('Y', 'X')
+
+# Map axis letters to selection keys
+_AXIS_MAP = {
+    'T': 'time',
+    'P': 'position',
+    'C': 'channel',
+    'Z': 'z'
+}
+
 
 class ExportConfirmationDialog(QDialog):
     """Dialog for confirming export with dimensions and file size estimate."""
@@ -58,6 +74,7 @@ class ExportConfirmationDialog(QDialog):
         # Warning message
         warning_label = QLabel("⚠ Please review the export details above before proceeding.")
         warning_label.setStyleSheet("color: orange; font-weight: bold;")
+        self.warning_label = warning_label
         layout.addWidget(warning_label)
         
         # Buttons
@@ -78,17 +95,9 @@ class ExportConfirmationDialog(QDialog):
         # Calculate resulting dimensions
         result_dims = {}
         
-        # Map axis letters to selection keys
-        axis_map = {
-            'T': 'time',
-            'P': 'position',
-            'C': 'channel',
-            'Z': 'z'
-        }
-        
-        for axis in ['T', 'P', 'C', 'Z']:
+        for axis in _CORE_AXES:
             if axis in dimensions:
-                key = axis_map.get(axis)
+                key = _AXIS_MAP.get(axis)
                 if key in selection and selection[key] is not None:
                     # Parse selection
                     if isinstance(selection[key], tuple) and len(selection[key]) == 2:
@@ -111,9 +120,9 @@ class ExportConfirmationDialog(QDialog):
         # Format dimensions string
         dims_str = []
         shape_info = []
-        for axis in ['T', 'P', 'C', 'Z', 'Y', 'X']:
+        for axis in _ALL_AXES:
             if axis in result_dims:
-                if axis in ['T', 'P', 'C', 'Z']:
+                if axis in _CORE_AXES:
                     dims_str.append(f"{axis}={result_dims[axis]}")
                 shape_info.append(str(result_dims[axis]))
         
@@ -125,9 +134,7 @@ class ExportConfirmationDialog(QDialog):
         
         # Calculate estimated file size
         # Use uint16 as typical export format (2 bytes per pixel)
-        total_pixels = 1
-        for size in result_dims.values():
-            total_pixels *= size
+        total_pixels = math.prod(result_dims.values())
         
         # Estimate: uint16 (2 bytes) + some overhead for TIFF metadata (typically 1-5%)
         estimated_bytes = total_pixels * 2
@@ -135,22 +142,19 @@ class ExportConfirmationDialog(QDialog):
         estimated_bytes = int(estimated_bytes * 1.1)
         
         # Format file size
-        if estimated_bytes < 1024:
-            size_text = f"{estimated_bytes} bytes"
-        elif estimated_bytes < 1024 * 1024:
-            size_text = f"{estimated_bytes / 1024:.1f} KB"
-        elif estimated_bytes < 1024 * 1024 * 1024:
-            size_text = f"{estimated_bytes / (1024 * 1024):.1f} MB"
-        else:
-            size_text = f"{estimated_bytes / (1024 * 1024 * 1024):.1f} GB"
+        size_text = f"{estimated_bytes} bytes"
+        for threshold, unit in _SIZE_UNITS:
+            if estimated_bytes >= threshold:
+                size_text = f"{estimated_bytes / threshold:.1f} {unit}"
+                break
         
         self.file_size_label.setText(size_text)
         
         # Add warning for large files
         if estimated_bytes > 1024 * 1024 * 1024:  # > 1 GB
             warning_text = "⚠ Large file size detected! This export will create a very large file. Consider reducing your selection."
-            self.findChild(QLabel).setText(warning_text)
-            self.findChild(QLabel).setStyleSheet("color: red; font-weight: bold;")
+            self.warning_label.setText(warning_text)
+            self.warning_label.setStyleSheet("color: red; font-weight: bold;")
     
     @staticmethod
     def confirm_export(parent, dimensions: Dict[str, Any], selection: Dict[str, Any]) -> bool:
@@ -22,7 +22,7 @@ class ND2FileHandler:
         self.loader = None
 
     def load_file(self, file_path: str):
-        """Load ND2 file in background thread."""
+        """Load ND2 file on the background worker pool."""
         logger.debug(f"Loading ND2 file: {file_path}")
 
         if not os.path.exists(file_path):
@@ -38,7 +38,7 @@ class ND2FileHandler:
         self.loader.finished.connect(self.on_file_loaded)
         self.loader.error.connect(self.on_load_error)
         self.loader.start()
-        logger.debug("ND2 loader thread started")
+        logger.debug("ND2 loader submitted to worker pool")
 
     def on_file_loaded(self, info: Dict[str, Any]):
         """Handle successful file load."""
@@ -79,7 +79,7 @@ class TiffExportHandler:
         time: tuple = None,
         z: tuple = None,
     ):
-        """Export ND2 file to TIFF in background thread."""
+        """Export ND2 file to TIFF on the background worker pool."""
         logger.debug(f"Exporting to TIFF: {output_path}")
 
         if not output_path:
@@ -87,25 +87,30 @@ class TiffExportHandler:
             QMessageBox.warning(None, "Error", "Please select an output file path.")
             return
 
+        # Reuse the loaded file info instead of reopening and re-parsing it
+        info = None
+        if self.gui_app.nd2_info.get("path") == nd2_path:
+            info = self.gui_app.nd2_info
+
         # Update UI state
         self.gui_app.set_exporting_state(True)
 
         # Start exporting in background
-        self.exporter = TiffExporter(nd2_path, output_path, position, channel, time, z)
+        self.exporter = TiffExporter(
+            nd2_path, output_path, position, channel, time, z, info=info
+        )
         self.exporter.progress.connect(self.gui_app.update_progress)
         self.exporter.finished.connect(self.on_export_finished)
         self.exporter.error.connect(self.on_export_error)
         self.exporter.start()
-        logger.debug("TIFF exporter thread started")
+        logger.debug("TIFF exporter submitted to worker pool")
 
     def on_export_finished(self, output_path: str):
         """Handle successful export."""
         logger.info(f"Export completed: {output_path}")
 
-        # Mark thread for cleanup but don't block
-        if self.exporter:
-            self.exporter.deleteLater()
-            self.exporter = None
+        # The pool releases the worker once run() returns
+        self.exporter = None
 
         self.gui_app.set_exporting_state(False)
         QMessageBox.information(
@@ -117,10 +122,8 @@ class TiffExportHandler:
         """Handle export error."""
         logger.error(f"Export error: {error_msg}")
 
-        # Mark thread for cleanup but don't block
-        if self.exporter:
-            self.exporter.deleteLater()
-            self.exporter = None
+        # The pool releases the worker once run() returns
+        self.exporter = None
 
         self.gui_app.set_exporting_state(False)
         QMessageBox.critical(None, "Export Error", error_msg)
@@ -147,8 +150,12 @@ class GUIEventHandler:
             QMessageBox.warning(None, "No File", "Please load an ND2 file first.")
             return
 
-        # Get dimension selection
-        dim_selection = self.main_window.dim_widget.get_selection()
+        # Get dimension selection; malformed text must not fall back to "all"
+        try:
+            dim_selection = self.main_window.dim_widget.get_selection()
+        except ValueError as e:
+            QMessageBox.warning(None, "Invalid Selection", str(e))
+            return
 
         # Import the dialog here to avoid circular imports
         from .dialogs import ExportConfirmationDialog
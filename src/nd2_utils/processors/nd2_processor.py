@@ -3,8 +3,10 @@ ND2 file processing module.
 """
 
 import logging
+import os
 from typing import Any, Dict, Optional
 
+import dask.array as da
 import nd2
 import numpy as np
 
@@ -14,6 +16,9 @@ from ..utils.threading import BaseWorkerThread, OperationCancelled
 
 logger = logging.getLogger(__name__)
 
+# Dask threads used to read/decode ND2 chunks; leaves cores for TIFF compression
+DASK_NUM_WORKERS = max(1, (os.cpu_count() or 2) // 2)
+
 
 # Module-level functions for ND2 file operations
 
@@ -74,19 +79,35 @@ def extract_subset(
     # Extract the subset from the xarray
     if slicers:
         logger.debug(f"Applying slices: {slicers}")
-        data_array = xarray.isel(slicers, drop=False)  # drop=False maintains dimensions
+        # Index the underlying dask array by position; same result as isel
+        # without rebuilding xarray coordinates and indexes
+        key = tuple(slicers.get(dim, slice(None)) for dim in xarray.dims)
         # Convert to numpy
-        data = data_array.compute()
+        data = _compute_to_numpy(xarray.data[key])
         logger.debug(f"Converted subset to numpy with shape: {data.shape}")
     else:
         # No subset selection, export entire file
         logger.debug("Exporting entire file")
-        data = xarray.compute()
+        data = _compute_to_numpy(xarray.data)
         logger.debug(f"Converted to numpy with shape: {data.shape}")
 
     return data
 
 
+def _compute_to_numpy(array) -> np.ndarray:
+    """Compute a (possibly dask-backed) array into a preallocated numpy buffer.
+
+    da.store writes each chunk straight into its region of the output, so no
+    per-chunk results have to be held and concatenated as with .compute().
+    """
+    if not isinstance(array, da.Array):
+        return np.asarray(array)
+
+    out = np.empty(array.shape, dtype=array.dtype)
+    da.store(array, out, lock=False, scheduler="threads", num_workers=DASK_NUM_WORKERS)
+    return out
+
+
 def build_ome_metadata(
     nd2_attrs: Dict[str, Any], source_filename: str
 ) -> Dict[str, Any]:
@@ -101,37 +122,42 @@ def build_ome_metadata(
     """
     metadata = {"Description": f"Exported from ND2 file: {source_filename}"}
 
-    # Extract pixel sizes if available
-    if isinstance(nd2_attrs, dict) and "pixelSizeUm" in nd2_attrs:
-        pixel_size = nd2_attrs["pixelSizeUm"]
-        if hasattr(pixel_size, "x") and pixel_size.x:
-            metadata["PhysicalSizeX"] = pixel_size.x
-            metadata["PhysicalSizeXUnit"] = "µm"
-        if hasattr(pixel_size, "y") and pixel_size.y:
-            metadata["PhysicalSizeY"] = pixel_size.y
-            metadata["PhysicalSizeYUnit"] = "µm"
-        if hasattr(pixel_size, "z") and pixel_size.z:
-            metadata["PhysicalSizeZ"] = pixel_size.z
-            metadata["PhysicalSizeZUnit"] = "µm"
-
-    # Extract channel names if available
-    if isinstance(nd2_attrs, dict) and "channelNames" in nd2_attrs:
-        channel_names = nd2_attrs["channelNames"]
+    if isinstance(nd2_attrs, dict):
+        # Extract pixel sizes if available
+        pixel_size = nd2_attrs.get("pixelSizeUm")
+        if pixel_size is not None:
+            if getattr(pixel_size, "x", None):
+                metadata["PhysicalSizeX"] = pixel_size.x
+                metadata["PhysicalSizeXUnit"] = "µm"
+            if getattr(pixel_size, "y", None):
+                metadata["PhysicalSizeY"] = pixel_size.y
+                metadata["PhysicalSizeYUnit"] = "µm"
+            if getattr(pixel_size, "z", None):
+                metadata["PhysicalSizeZ"] = pixel_size.z
+                metadata["PhysicalSizeZUnit"] = "µm"
+
+        # Extract channel names if available
+        channel_names = nd2_attrs.get("channelNames")
         if channel_names:
             metadata["Channel"] = {"Name": list(channel_names)}
 
-    # Extract time loop information if available
-    if isinstance(nd2_attrs, dict) and "loops" in nd2_attrs:
-        loops = nd2_attrs["loops"]
-        # Find TimeLoop
-        for loop in loops if hasattr(loops, "__iter__") else []:
-            if hasattr(loop, "type") and loop.type == "TimeLoop":
-                if hasattr(loop, "parameters") and hasattr(loop.parameters, "periodMs"):
-                    period_ms = loop.parameters.periodMs
-                    if period_ms:
-                        metadata["TimeIncrement"] = period_ms
-                        metadata["TimeIncrementUnit"] = "ms"
-                break
+        # Extract time loop information if available
+        loops = nd2_attrs.get("loops")
+        if isinstance(loops, dict):
+            # Loops keyed by type
+            time_loop = loops.get("TimeLoop")
+        elif loops is not None and hasattr(loops, "__iter__"):
+            time_loop = next(
+                (loop for loop in loops if getattr(loop, "type", None) == "TimeLoop"),
+                None,
+            )
+        else:
+            time_loop = None
+
+        period_ms = getattr(getattr(time_loop, "parameters", None), "periodMs", None)
+        if period_ms:
+            metadata["TimeIncrement"] = period_ms
+            metadata["TimeIncrementUnit"] = "ms"
 
     logger.debug(f"Built OME metadata with keys: {list(metadata.keys())}")
     return metadata
@@ -150,26 +176,10 @@ class ND2Processor(BaseWorkerThread):
             self._check_cancelled()
             logger.debug(f"Starting to load file: {self.file_path}")
 
-            self._check_cancelled()
-            # Use imread with xarray=True, dask=True
-            logger.debug("Calling nd2.imread with xarray=True, dask=True")
-            my_array = nd2.imread(self.file_path, xarray=True, dask=True)
-            logger.debug(f"imread returned xarray with shape: {my_array.shape}")
-
-            self._check_cancelled()
-            # Extract metadata from xarray attributes
-            logger.debug("Extracting metadata from xarray attrs")
-            attrs = my_array.attrs.get("metadata", {})
+            # Same loading path as the synchronous load_file()
+            info = load_file(self.file_path)
 
             self._check_cancelled()
-            # Build comprehensive info dict
-            info = MetadataHandler.build_info_dict(self.file_path, my_array, attrs)
-
-            # Parse dimension information
-            self._check_cancelled()
-            dimensions = DimensionParser.parse_dimensions(my_array)
-            info["dimensions"] = dimensions
-
             logger.debug("Emitting finished signal with info")
             self.finished.emit(info)
 
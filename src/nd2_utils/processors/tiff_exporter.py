@@ -2,12 +2,16 @@
 TIFF export module for ND2 to TIFF conversion.
 """
 
+import functools
+import itertools
 import logging
 import os
-from typing import Any, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
 
-import nd2
+import dask
 import numpy as np
+from tifffile import TiffWriter, imwrite
 
 from ..utils.dimensions import DimensionParser
 from ..utils.threading import BaseWorkerThread, OperationCancelled
@@ -15,6 +19,18 @@ from . import nd2_processor
 
 logger = logging.getLogger(__name__)
 
+# Lossless compression for exported TIFFs; zlib (deflate) needs no extra codecs
+TIFF_COMPRESSION = "zlib"
+TIFF_COMPRESSION_LEVEL = 1
+
+# Output buffer size; fewer, larger writes help on network shares and slow media
+TIFF_WRITE_BUFFER = 4 * 1024 * 1024
+
+# Dtypes written unchanged; anything else is converted to uint16
+TIFF_PASSTHROUGH_DTYPES = (np.uint8, np.uint16, np.float32)
+# export_to_tiff has always kept float64 as well
+EXPORT_PASSTHROUGH_DTYPES = TIFF_PASSTHROUGH_DTYPES + (np.float64,)
+
 
 # Module-level functions for TIFF export operations
 
@@ -26,6 +42,7 @@ def export_to_tiff(
     channel: Optional[tuple] = None,
     time: Optional[tuple] = None,
     z: Optional[tuple] = None,
+    compression: Optional[str] = TIFF_COMPRESSION,
 ) -> str:
     """Export ND2 file to TIFF format.
 
@@ -36,6 +53,10 @@ def export_to_tiff(
         channel: Channel range to export
         time: Time range to export
         z: Z-slice range to export
+        compression: tifffile compression codec, or None for uncompressed output
+
+    uint8, uint16, float32 and float64 data is written unchanged; other dtypes
+    are converted to uint16 (see _plane_converter).
 
     Returns:
         Path to the exported TIFF file
@@ -48,60 +69,237 @@ def export_to_tiff(
     # Extract ND2 attributes for metadata
     nd2_attrs = info.get("attributes", {})
 
-    data = nd2_processor.extract_subset(info, position, channel, time, z)
-
-    # Convert data type if needed
-    if data.dtype not in [np.uint8, np.uint16, np.float32, np.float64]:
-        logger.debug(f"Converting data type from {data.dtype} to uint16")
-        if data.dtype.kind == "f":
-            data_max = np.nanmax(data)
-            if data_max > 0:
-                data = (data / data_max * 65535).astype(np.uint16)
-            else:
-                data = np.zeros_like(data, dtype=np.uint16)
-        else:
-            data = data.astype(np.uint16)
+    # Lazily select the export region; planes are read while writing
+    slicers = DimensionParser.build_slicer_dict(
+        position=position,
+        channel=channel,
+        time=time,
+        z=z,
+        dimensions=info["dimensions"],
+    )
+    selection = DimensionParser.select_5d(info["xarray"], slicers)
 
     # Build OME metadata from ND2 attributes
     metadata = nd2_processor.build_ome_metadata(nd2_attrs, os.path.basename(nd2_path))
 
     # Write file
-    write_tiff(output_path, data, metadata)
+    write_tiff_streaming(
+        output_path,
+        selection,
+        metadata,
+        compression=compression,
+        passthrough_dtypes=EXPORT_PASSTHROUGH_DTYPES,
+    )
 
     logger.info(f"Successfully exported to: {output_path}")
     return output_path
 
 
-def write_tiff(output_path: str, data_5d: np.ndarray, metadata: Dict[str, Any]):
+def write_tiff(
+    output_path: str,
+    data_5d: np.ndarray,
+    metadata: Dict[str, Any],
+    compression: Optional[str] = TIFF_COMPRESSION,
+):
     """Write 5D data (T, P, C, Y, X) to 4D TIFF with flattened P×C dimensions.
 
     Args:
         output_path: Path where the TIFF file will be written
         data_5d: 5D numpy array with shape (T, P, C, Y, X)
         metadata: OME-TIFF metadata dictionary
+        compression: tifffile compression codec, or None for uncompressed output
     """
-    from tifffile import imwrite
-
     shape = data_5d.shape
     t, p, c, y, x = shape
 
     # Flatten P×C dimensions for ImageJ compatibility (TCYX format)
     # New shape: (T, P*C, Y, X)
     new_shape = (t, p * c, y, x)
-    data_to_write = data_5d.reshape(new_shape)
+    if data_5d.flags.c_contiguous:
+        # Reshape is a free view for C-contiguous data
+        data_to_write = data_5d.reshape(new_shape)
+    else:
+        # Reshape would copy the whole array; hand tifffile plane views instead
+        data_to_write = (
+            data_5d[ti, pi, ci]
+            for ti, pi, ci in itertools.product(range(t), range(p), range(c))
+        )
+
+    # Add axes to metadata (structural information about the data)
+    tiff_metadata = metadata.copy()
+    tiff_metadata["axes"] = "TCYX"  # Tell viewers: Time, Channel, Y, X
+
+    # Write BigTIFF file
+    with open(output_path, "wb", buffering=TIFF_WRITE_BUFFER) as fh:
+        imwrite(
+            fh,
+            data_to_write,
+            shape=new_shape,
+            dtype=data_5d.dtype,
+            bigtiff=True,
+            photometric="minisblack",
+            metadata=tiff_metadata,
+            ome=True,
+            **_compression_kwargs(data_5d.dtype, compression),
+        )
+
+    logger.info(
+        f"Successfully wrote TIFF file with shape: {new_shape} (T={t}, C={p * c}, Y={y}, X={x})"
+    )
+
+
+def write_tiff_streaming(
+    output_path: str,
+    selection,
+    metadata: Dict[str, Any],
+    on_plane: Optional[Callable[[int, int], None]] = None,
+    compression: Optional[str] = TIFF_COMPRESSION,
+    passthrough_dtypes=TIFF_PASSTHROUGH_DTYPES,
+):
+    """Stream a lazy (T, P, C, Y, X) selection to a 4D TIFF one YX plane at a time.
+
+    At most two frames (the one being written and the prefetched next one) are
+    held in memory, so exports can be larger than RAM.
+
+    Args:
+        output_path: Path where the TIFF file will be written
+        selection: xarray DataArray with dims (T, P, C, Y, X), typically dask-backed
+        metadata: OME-TIFF metadata dictionary
+        on_plane: Optional callback invoked as on_plane(index, total) before each
+                  plane is written; may raise to abort the export
+        compression: tifffile compression codec, or None for uncompressed output
+        passthrough_dtypes: Dtypes written unchanged; others are converted to
+                            uint16 (see _plane_converter)
+    """
+    t, p, c, y, x = selection.shape
+
+    # Flatten P×C dimensions for ImageJ compatibility (TCYX format)
+    new_shape = (t, p * c, y, x)
+    total = t * p * c
+
+    with _dask_threads():
+        dtype, convert = _plane_converter(selection, passthrough_dtypes)
 
     # Add axes to metadata (structural information about the data)
     tiff_metadata = metadata.copy()
     tiff_metadata["axes"] = "TCYX"  # Tell viewers: Time, Channel, Y, X
 
+    data = selection.data
+
+    def read_frame(ti, pi):
+        return np.asarray(data[ti, pi])
+
+    def planes():
+        # Plane order matches a C-order reshape of (T, P, C) to (T, P*C).
+        # ND2 stores all channels in one frame (one dask chunk), so read the
+        # C planes of each (T, P) together instead of decoding the frame C times.
+        # The next frame is read on a helper thread while the current one is
+        # compressed and written, overlapping disk reads with encoding.
+        frames = list(itertools.product(range(t), range(p)))
+        index = 0
+        with ThreadPoolExecutor(max_workers=1) as reader:
+            pending = reader.submit(read_frame, *frames[0]) if frames else None
+            for n in range(len(frames)):
+                frame = pending.result()
+                if n + 1 < len(frames):
+                    pending = reader.submit(read_frame, *frames[n + 1])
+                for ci in range(c):
+                    if on_plane is not None:
+                        on_plane(index, total)
+                    plane = frame[ci]
+                    yield convert(plane) if convert is not None else plane
+                    index += 1
+
     # Write BigTIFF file
-    imwrite(output_path, data_to_write, bigtiff=True, metadata=tiff_metadata, ome=True)
+    fh = open(output_path, "wb", buffering=TIFF_WRITE_BUFFER)
+    try:
+        with _dask_threads(), fh, TiffWriter(fh, bigtiff=True, ome=True) as tif:
+            tif.write(
+                planes(),
+                shape=new_shape,
+                dtype=dtype,
+                photometric="minisblack",
+                metadata=tiff_metadata,
+                **_compression_kwargs(dtype, compression),
+            )
+    except BaseException:
+        # Pages are written as the export runs; don't leave a truncated TIFF behind
+        logger.debug(f"Removing partial TIFF file: {output_path}")
+        try:
+            os.remove(output_path)
+        except OSError:
+            pass
+        raise
 
     logger.info(
-        f"Successfully wrote TIFF file with shape: {data_to_write.shape} (T={t}, C={p * c}, Y={y}, X={x})"
+        f"Successfully wrote TIFF file with shape: {new_shape} (T={t}, C={p * c}, Y={y}, X={x})"
     )
 
 
+def _dask_threads():
+    """Context manager running dask reads on a bounded threaded scheduler."""
+    return dask.config.set(
+        scheduler="threads", num_workers=nd2_processor.DASK_NUM_WORKERS
+    )
+
+
+def _compression_kwargs(dtype, compression: Optional[str]) -> Dict[str, Any]:
+    """Build tifffile compression arguments for the given output dtype.
+
+    The horizontal-differencing predictor helps a lot on spatially correlated
+    microscopy data; it is only used for integer data since the floating point
+    predictor requires imagecodecs. maxworkers is left to tifffile, which
+    compresses strips in parallel but stays single-threaded for segments too
+    small to benefit. Returns no arguments when compression is None.
+    """
+    if compression is None:
+        return {}
+    kwargs = {
+        "compression": compression,
+        "predictor": 2 if np.dtype(dtype).kind in "iu" else None,
+    }
+    if compression == TIFF_COMPRESSION:
+        kwargs["compressionargs"] = {"level": TIFF_COMPRESSION_LEVEL}
+    return kwargs
+
+
+def _plane_converter(selection, passthrough_dtypes=TIFF_PASSTHROUGH_DTYPES):
+    """Choose the output dtype and a per-plane conversion function.
+
+    Dtypes in passthrough_dtypes are written as-is. Other floating point data
+    is scaled to uint16 using the global maximum of the selection; other
+    integer types are cast to uint16.
+
+    Returns:
+        Tuple of (output dtype, conversion function or None)
+    """
+    dtype = selection.dtype
+    if dtype in passthrough_dtypes:
+        return dtype, None
+
+    logger.debug(f"Converting data type from {dtype} to uint16")
+    if dtype.kind == "f":
+        # One streamed pass over the selection for the scale factor
+        data_max = float(selection.max(skipna=True))
+        if data_max > 0:
+            scale = 65535.0 / data_max
+            return np.uint16, lambda plane: _scale_to_uint16(plane, scale)
+        return np.uint16, lambda plane: np.zeros_like(plane, dtype=np.uint16)
+
+    return np.uint16, lambda plane: plane.astype(np.uint16)
+
+
+def _scale_to_uint16(plane: np.ndarray, scale: float) -> np.ndarray:
+    """Scale a floating point plane to uint16 in a single pass.
+
+    The multiply writes straight into the uint16 output instead of allocating
+    float temporaries for the divide and multiply; NaNs become 0.
+    """
+    out = np.zeros(plane.shape, dtype=np.uint16)
+    np.multiply(plane, scale, out=out, where=~np.isnan(plane), casting="unsafe")
+    return out
+
+
 class TiffExporter(BaseWorkerThread):
     """Worker thread for exporting ND2 files to TIFF format."""
 
@@ -113,6 +311,8 @@ class TiffExporter(BaseWorkerThread):
         channel: Optional[tuple] = None,
         time: Optional[tuple] = None,
         z: Optional[tuple] = None,
+        info: Optional[Dict[str, Any]] = None,
+        compression: Optional[str] = TIFF_COMPRESSION,
     ):
         super().__init__()
         self.nd2_path = nd2_path
@@ -121,6 +321,8 @@ class TiffExporter(BaseWorkerThread):
         self.channel = channel  # Can be None, (start, end), or (value, value)
         self.time = time  # Can be None, (start, end), or (value, value)
         self.z = z  # Can be None, (start, end), or (value, value)
+        self.info = info  # load_file() result for nd2_path, if already loaded
+        self.compression = compression  # tifffile codec, None for uncompressed
 
     def run(self):
         """Export ND2 file to TIFF format."""
@@ -128,91 +330,54 @@ class TiffExporter(BaseWorkerThread):
             self._check_cancelled()
             logger.info("Starting export process")
 
-            self.progress.emit(10)
+            self._emit_progress(10, force=True)
 
             self._check_cancelled()
-            # Load ND2 file
-            logger.debug("Calling nd2.imread with xarray=True, dask=True")
-            my_array = nd2.imread(self.nd2_path, xarray=True, dask=True)
-            logger.debug(f"Successfully loaded ND2 file with shape: {my_array.shape}")
-
-            self.progress.emit(20)
-
-            self._check_cancelled()
-            # Extract metadata
-            logger.debug("Extracting metadata from xarray attrs")
-            attrs = my_array.attrs.get("metadata", {})
-            nd2_attrs = attrs.get("attributes", {})
-
-            # Convert attributes if needed
-            if not isinstance(nd2_attrs, dict) and hasattr(nd2_attrs, "__dict__"):
-                nd2_attrs_dict = vars(nd2_attrs)
+            # Load ND2 file unless the caller already has it open
+            if self.info is not None:
+                logger.debug("Reusing already-loaded file info")
+                info = self.info
             else:
-                nd2_attrs_dict = nd2_attrs if isinstance(nd2_attrs, dict) else {}
+                info = nd2_processor.load_file(self.nd2_path)
+            my_array = info["xarray"]
+            logger.debug(f"Successfully loaded ND2 file with shape: {my_array.shape}")
 
-            self.progress.emit(40)
+            self._emit_progress(20, force=True)
 
             self._check_cancelled()
-            # Extract data using slicer-based batched processing
-            logger.debug("Extracting data with slicer-based batched processing")
-            dimensions = DimensionParser.parse_dimensions(my_array)
-
-            # Build slicer dictionary - unselected dimensions become full ranges
+            # Lazily select the export region; data is read plane by plane while writing.
+            # Unselected dimensions become full ranges
             slicers = DimensionParser.build_slicer_dict(
                 position=self.position,
                 channel=self.channel,
                 time=self.time,
                 z=self.z,
-                dimensions=dimensions,
+                dimensions=info["dimensions"],
             )
+            selection = DimensionParser.select_5d(my_array, slicers)
 
-            # Extract data using tqdm progress - tqdm handles its own progress display
-            data = DimensionParser.extract_data_with_progress(
-                my_array, slicers, desc="Extracting data"
-            )
-            logger.debug(f"Extracted data with shape: {data.shape}")
-
-            self._check_cancelled()
-            # Ensure proper data type
-            if not isinstance(data, np.ndarray):
-                logger.warning(
-                    f"Data is still not numpy array (type: {type(data)}), converting"
-                )
-                data = np.asarray(data)
-
-            self.progress.emit(60)
+            t, p, c, y, x = selection.shape
+            logger.info(f"Exporting with dimensions T={t}, P={p}, C={c}, Y={y}, X={x}")
 
-            # Data should already be 5D from extraction
-            # No need to pad - ensure_5d_structure should only verify structure
+            # Build OME metadata from ND2 attributes
+            metadata = nd2_processor.build_ome_metadata(
+                info.get("attributes", {}), os.path.basename(self.nd2_path)
+            )
 
-            self._check_cancelled()
-            # Convert data type if needed - preserve uint16 if possible
-            logger.debug(f"Input data dtype: {data.dtype}")
-
-            if data.dtype not in [np.uint8, np.uint16, np.float32]:
-                if data.dtype == np.float64:
-                    # If we got float64, convert to uint16 (likely from dask computation)
-                    logger.debug(f"Converting data type from {data.dtype} to uint16")
-                    data_max = np.nanmax(data)
-                    if data_max > 0:
-                        data = (data / data_max * 65535).astype(np.uint16)
-                    else:
-                        data = np.zeros_like(data, dtype=np.uint16)
-                elif data.dtype.kind != "f":
-                    # For integer types other than uint8/uint16
-                    data = data.astype(np.uint16)
-                else:
-                    # For float32 - keep as is
-                    pass
-            logger.debug(f"Final data dtype: {data.dtype}")
-
-            self.progress.emit(80)
+            self._emit_progress(40, force=True)
 
             self._check_cancelled()
-            # Write TIFF file
-            self._write_tiff_file(data, nd2_attrs_dict)
+            # Stream planes to the TIFF file
+            logger.info(f"Writing TIFF file to: {self.output_path}")
+            write_tiff_streaming(
+                self.output_path,
+                selection,
+                metadata,
+                on_plane=functools.partial(self._on_plane, self.cancel_checker()),
+                compression=self.compression,
+            )
 
-            self.progress.emit(90)
+            self._emit_progress(90, force=True)
             self.finished.emit(self.output_path)
 
             # Clean exit - thread will be cleaned up by event loop
@@ -225,39 +390,8 @@ class TiffExporter(BaseWorkerThread):
             logger.exception(f"Error during export: {e}")
             self.error.emit(f"Error exporting to TIFF: {str(e)}")
 
-    def _write_tiff_file(self, data: np.ndarray, nd2_attrs: Dict[str, Any]):
-        """Write the data to a TIFF file."""
-        logger.info(f"Writing TIFF file to: {self.output_path}")
-
-        # Ensure data is contiguous
-        data = np.ascontiguousarray(data)
-        logger.debug(f"Final data shape: {data.shape}, dtype: {data.dtype}")
-
-        # Handle data type conversion
-        if data.dtype not in [np.uint8, np.uint16, np.float32]:
-            logger.debug(f"Converting data type from {data.dtype} to uint16")
-            if data.dtype.kind == "f":
-                data_max = np.nanmax(data)
-                if data_max > 0:
-                    data = (data / data_max * 65535).astype(np.uint16)
-                else:
-                    data = np.zeros_like(data, dtype=np.uint16)
-            else:
-                data = data.astype(np.uint16)
-            logger.debug(f"Converted data to dtype: {data.dtype}")
-
-        # Get dimensions
-        if len(data.shape) == 5:
-            t, p, c, y, x = data.shape
-        else:
-            raise ValueError(f"Expected 5D data, got {data.shape}")
-
-        logger.info(f"Exporting with dimensions T={t}, P={p}, C={c}, Y={y}, X={x}")
-
-        # Build OME metadata from ND2 attributes
-        metadata = nd2_processor.build_ome_metadata(
-            nd2_attrs, os.path.basename(self.nd2_path)
-        )
-
-        # Write TIFF file with metadata
-        write_tiff(self.output_path, data, metadata)
+    def _on_plane(self, is_cancelled: Callable[[], bool], index: int, total: int):
+        """Check for cancellation and report progress before each plane is written."""
+        if is_cancelled():
+            raise OperationCancelled("Operation was cancelled by user")
+        self._emit_progress(40 + (50 * index) // total)
@@ -4,6 +4,14 @@ Utility functions for ND2 processing.
 
 from .metadata import MetadataHandler
 from .dimensions import DimensionParser
-from .threading import BaseWorkerThread
+from .ranges import parse_range
 
-__all__ = ['MetadataHandler', 'DimensionParser', 'BaseWorkerThread']
+__all__ = ['MetadataHandler', 'DimensionParser', 'BaseWorkerThread', 'parse_range']
+
+
+def __getattr__(name):
+    # BaseWorkerThread pulls in PySide6; only import it when actually requested
+    if name == 'BaseWorkerThread':
+        from .threading import BaseWorkerThread
+        return BaseWorkerThread
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,16 +2,36 @@
 Dimension parsing and handling utilities for ND2 files.
 """
 
-import itertools
 import logging
 from typing import Any, Dict, Optional
 
+import dask.array as da
 import numpy as np
+from dask.callbacks import Callback
 from tqdm import tqdm
 
 logger = logging.getLogger(__name__)
 
 
+class _TqdmCallback(Callback):
+    """Dask callback advancing a tqdm bar as graph tasks finish."""
+
+    def __init__(self, desc: str):
+        super().__init__()
+        self._desc = desc
+        self._pbar = None
+
+    def _start_state(self, dsk, state):
+        total = sum(len(state[k]) for k in ("ready", "waiting", "running", "finished"))
+        self._pbar = tqdm(total=total, desc=self._desc)
+
+    def _posttask(self, key, result, dsk, state, worker_id):
+        self._pbar.update(1)
+
+    def _finish(self, dsk, state, errored):
+        self._pbar.close()
+
+
 class DimensionParser:
     """Handles dimension parsing and validation for ND2 files."""
 
@@ -85,9 +105,10 @@ class DimensionParser:
     def extract_data_with_progress(
         xarray, slicers, desc="Processing data"
     ) -> np.ndarray:
-        """Extract data in batches using isel wrapper with tqdm progress bar.
+        """Extract data using a single lazy isel with a tqdm progress bar.
 
-        Handles multiple batch dimensions by creating all combinations and looping through them.
+        Multiple batch dimensions are selected together and computed as one dask
+        graph; the progress bar advances as its tasks finish.
 
         Args:
             xarray: The xarray DataArray to extract from
@@ -105,6 +126,7 @@ class DimensionParser:
         dim_indices = {}
         batch_dims = []
         fixed_dims = {}
+        contiguous_dims = set()
 
         for dim, value in slicers.items():
             if dim not in xarray.dims:
@@ -120,6 +142,7 @@ class DimensionParser:
                     # For ranges, end is inclusive, so add 1 for Python range
                     indices = list(range(start, end + 1))
                     dim_indices[dim] = indices
+                    contiguous_dims.add(dim)
                     if len(indices) > 1:
                         batch_dims.append(dim)
             elif isinstance(value, (list, tuple)) and len(value) > 2:
@@ -145,84 +168,101 @@ class DimensionParser:
         logger.debug(f"Batch dimensions: {batch_dims}")
         logger.debug(f"Fixed dimensions: {fixed_dims}")
 
-        # Generate all combinations of batch dimension indices
-        batch_combinations = list(
-            itertools.product(*[dim_indices[dim] for dim in batch_dims])
-        )
-
-        total_combinations = len(batch_combinations)
-        logger.debug(
-            f"Generated {total_combinations} combinations for {len(batch_dims)} batch dimensions"
-        )
-
-        # Pre-allocate array directly in xarray.dims order (no transpose needed!)
-        logger.debug("Pre-allocating result array in xarray.dims order")
-
-        # Build final shape in xarray.dims order
-        final_shape = []
-        for dim in xarray.dims:
-            if dim in batch_dims:
-                final_shape.append(len(dim_indices[dim]))
-            elif dim in fixed_dims:
-                final_shape.append(1)
+        # Select everything lazily in one go: ranges become slices and fixed
+        # dims stay as length-1 axes, so the result keeps xarray.dims order
+        indexers = {dim: [value] for dim, value in fixed_dims.items()}
+        for dim in batch_dims:
+            indices = dim_indices[dim]
+            if dim in contiguous_dims:
+                indexers[dim] = slice(indices[0], indices[-1] + 1)
             else:
-                # Non-batch, non-fixed dimension keeps its full size
-                final_shape.append(xarray.sizes[dim])
+                indexers[dim] = indices
+        selection = xarray.isel(indexers)
 
-        result_array = np.zeros(final_shape, dtype=xarray.dtype)
+        result_array = np.empty(selection.shape, dtype=xarray.dtype)
         logger.debug(
             f"Pre-allocated array with shape: {result_array.shape}, dtype: {result_array.dtype}"
         )
 
-        # Create mapping from original indices to result array indices
-        index_maps = {
-            dim: {
-                orig_idx: result_idx
-                for result_idx, orig_idx in enumerate(dim_indices[dim])
-            }
-            for dim in batch_dims
-        }
-
-        # Create mapping from dimension name to its position in xarray.dims
-        dim_positions = {dim: i for i, dim in enumerate(xarray.dims)}
-
-        # Single for loop writing directly into pre-allocated array
-        iterator = tqdm(
-            batch_combinations,
-            desc=f"{desc} ({','.join(batch_dims)})",
-        )
+        data = selection.data
+        if isinstance(data, da.Array):
+            # A single graph for the whole selection: dask reads chunks in parallel
+            # and writes them straight into the result; tqdm tracks finished tasks
+            with _TqdmCallback(desc=f"{desc} ({','.join(batch_dims)})"):
+                da.store(data, result_array, lock=False, scheduler="threads")
+        else:
+            result_array[...] = data
 
-        for combination in iterator:
-            # Build slicers for this combination
-            current_slicers = fixed_dims.copy()
-            for i, dim in enumerate(batch_dims):
-                current_slicers[dim] = combination[i]
+        logger.debug(f"Final result shape: {result_array.shape}")
+        return result_array
 
-            # Extract the chunk
-            chunk = xarray.isel(current_slicers, drop=False).compute()
+    @staticmethod
+    def select_5d(xarray, slicers):
+        """Lazily select a region of the xarray arranged as (T, P, C, Y, X).
 
-            # Preserve original dtype from dask/xarray to prevent float64 promotion
-            if hasattr(chunk, "dtype") and chunk.dtype != xarray.dtype:
-                chunk = chunk.astype(xarray.dtype)
+        Nothing is computed; for dask-backed arrays the result stays lazy so
+        callers can read it plane by plane.
 
-            # Build array indices in xarray.dims order
-            array_indices = [slice(None)] * len(xarray.dims)
-            for i, dim in enumerate(batch_dims):
-                # Map this batch dimension to its position in xarray.dims
-                pos = dim_positions[dim]
-                # Get the result array index for this original index
-                array_indices[pos] = index_maps[dim][combination[i]]
+        Args:
+            xarray: The xarray DataArray to select from
+            slicers: Dictionary with dimension names as keys and single indices,
+                    inclusive [start, end] ranges or explicit index lists as values
+                    (see build_slicer_dict)
 
-            # For fixed dimensions, use index 0
-            for dim in fixed_dims:
-                pos = dim_positions[dim]
-                array_indices[pos] = 0
+        Returns:
+            xarray.DataArray with dims (T, P, C, Y, X); absent axes have size 1
 
-            result_array[tuple(array_indices)] = chunk
+        Raises:
+            ValueError: If a selection is out of range or a range is reversed
+        """
+        indexers = {}
+        for dim, value in slicers.items():
+            if dim not in xarray.dims or value is None:
+                continue
+            size = xarray.sizes[dim]
 
-        # No transpose needed - array is already in correct order!
-        logger.debug(f"Final result shape: {result_array.shape}")
-        return result_array
+            if isinstance(value, (list, tuple)) and len(value) == 2:
+                # Inclusive [start, end] range; slices would silently clamp
+                start, end = value
+                if not 0 <= start <= end < size:
+                    raise ValueError(
+                        f"Invalid range {start}-{end} for axis {dim} with size {size}"
+                    )
+                indexers[dim] = slice(start, end + 1)
+            else:
+                # Keep single selections as length-1 axes
+                indices = list(value) if isinstance(value, (list, tuple)) else [value]
+                invalid = [index for index in indices if not 0 <= index < size]
+                if invalid:
+                    raise ValueError(
+                        f"Index {invalid[0]} out of range for axis {dim} with size {size}"
+                    )
+                indexers[dim] = indices
+
+        selection = xarray.isel(indexers) if indexers else xarray
+
+        # Axes outside (T, P, C, Y, X) can only be exported as a single plane
+        extra_dims = [
+            dim for dim in selection.dims if dim not in DimensionParser.STANDARD_AXES
+        ]
+        for dim in extra_dims:
+            if selection.sizes[dim] != 1:
+                raise ValueError(
+                    f"Cannot export axis {dim} with size {selection.sizes[dim]}; "
+                    "select a single index"
+                )
+        if extra_dims:
+            selection = selection.squeeze(extra_dims, drop=True)
+
+        missing_dims = [
+            dim for dim in DimensionParser.STANDARD_AXES if dim not in selection.dims
+        ]
+        if missing_dims:
+            selection = selection.expand_dims(missing_dims)
+
+        selection = selection.transpose(*DimensionParser.STANDARD_AXES)
+        logger.debug(f"Selected 5D region with shape: {selection.shape}")
+        return selection
 
     @staticmethod
     def build_slicer_dict(
@@ -304,8 +344,8 @@ class DimensionParser:
         # P and C should be padded in positions 1 and 2, not at the beginning
 
         if len(data.shape) == 5:
-            # Already 5D
-            shape_order = list(data.shape)
+            # Already 5D, nothing to do
+            return data
         elif len(data.shape) == 3:
             # Assume (T, Y, X) -> add P=1, C=1
             t, y, x = data.shape
@@ -328,10 +368,9 @@ class DimensionParser:
                 data = np.expand_dims(data, axis=0)
             return data
 
-        # Reshape to correct order if needed
-        if len(data.shape) != len(shape_order):
-            logger.debug(f"Reshaping from {data.shape} to {shape_order}")
-            data = data.reshape(shape_order)
+        # Reshape to correct order
+        logger.debug(f"Reshaping from {data.shape} to {shape_order}")
+        data = data.reshape(shape_order)
 
         logger.debug(f"Final data shape: {data.shape}")
         return data
@@ -0,0 +1,35 @@
+"""
+Range string parsing utilities for dimension selection.
+"""
+
+import re
+from functools import lru_cache
+from typing import Optional, Tuple
+
+# Matches "5" or "0-9" (whitespace tolerant)
+_RANGE_RE = re.compile(r"^\s*(\d+)(?:\s*-\s*(\d+))?\s*$")
+
+
+@lru_cache(maxsize=128)
+def parse_range(text: Optional[str]) -> Optional[Tuple[int, int]]:
+    """Parse a range string like '0' or '0-1' into an inclusive (start, end) tuple.
+
+    Args:
+        text: Range string to parse
+
+    Returns:
+        (start, end) tuple, or None if the string is empty
+
+    Raises:
+        ValueError: If the string is not a valid index or range
+    """
+    if not text or text.isspace():
+        return None
+
+    match = _RANGE_RE.match(text)
+    if not match:
+        raise ValueError(f"Invalid range '{text.strip()}'; use e.g. 0 or 0-4")
+
+    start = int(match.group(1))
+    end = int(match.group(2)) if match.group(2) is not None else start
+    return start, end
@@ -3,41 +3,98 @@ Threading utilities for background operations.
 """
 
 import logging
-from typing import Callable
+import threading
+import time
+from typing import Callable, Optional
 
-from PySide6.QtCore import QThread, Signal
+from PySide6.QtCore import QObject, QRunnable, QThread, QThreadPool, Signal
 
 logger = logging.getLogger(__name__)
 
+_pool_configured = False
 
-class BaseWorkerThread(QThread):
-    """Base class for worker threads with common functionality."""
+# Minimum time between throttled progress emits (~20 updates per second)
+PROGRESS_INTERVAL_NS = 50_000_000
+
+
+def worker_pool() -> QThreadPool:
+    """Return the shared thread pool used for background workers.
+
+    The pool is capped on first use so concurrent loads/exports cannot
+    oversubscribe the cores that dask and tifffile also draw on.
+    """
+    global _pool_configured
+    pool = QThreadPool.globalInstance()
+    if not _pool_configured:
+        pool.setMaxThreadCount(max(2, QThread.idealThreadCount() - 3))
+        logger.debug(f"Worker pool capped at {pool.maxThreadCount()} threads")
+        _pool_configured = True
+    return pool
+
+
+class WorkerSignals(QObject):
+    """Signals for pooled workers (QRunnable itself is not a QObject)."""
 
-    # Common signals
     progress = Signal(int)
     finished = Signal(object)
     error = Signal(str)
 
+
+class BaseWorkerThread(QRunnable):
+    """Base class for background workers run on the shared thread pool."""
+
     def __init__(self):
         super().__init__()
-        self._is_cancelled = False
+        self.signals = WorkerSignals()
+        # Common signals, exposed on the worker so callers connect as usual
+        self.progress = self.signals.progress
+        self.finished = self.signals.finished
+        self.error = self.signals.error
+        # Bound once so the hot progress path skips the signal/emit lookups
+        self._raw_progress_emit = self.signals.progress.emit
+        # Set from the GUI thread, polled from the worker thread
+        self._cancel_event = threading.Event()
+        self._last_progress = None
+        self._last_emit_ns = 0
+
+    def start(self):
+        """Submit the worker to the shared thread pool."""
+        worker_pool().start(self)
 
     def cancel(self):
         """Cancel the operation."""
         logger.debug("Worker thread cancelled")
-        self._is_cancelled = True
+        self._cancel_event.set()
 
     def is_cancelled(self) -> bool:
         """Check if operation was cancelled."""
-        return self._is_cancelled
+        return self._cancel_event.is_set()
+
+    def cancel_checker(self) -> Callable[[], bool]:
+        """Return a cheap callable reporting cancellation, to bind once before hot loops."""
+        return self._cancel_event.is_set
 
     def run(self):
         """Override in subclasses to implement the actual work."""
         raise NotImplementedError("Subclasses must implement run() method")
 
+    def _emit_progress(self, progress: int, force: bool = False):
+        """Emit progress from a hot loop, skipping repeats and throttling to ~20 Hz.
+
+        Each emit is a queued cross-thread call into the GUI event loop. Pass
+        force=True for milestones that must not be throttled away.
+        """
+        if progress == self._last_progress:
+            return
+        now = time.monotonic_ns()
+        if force or progress >= 100 or now - self._last_emit_ns >= PROGRESS_INTERVAL_NS:
+            self._last_progress = progress
+            self._last_emit_ns = now
+            self._raw_progress_emit(progress)
+
     def _check_cancelled(self):
         """Check if operation was cancelled and raise exception if so."""
-        if self._is_cancelled:
+        if self._cancel_event.is_set():
             raise OperationCancelled("Operation was cancelled by user")
 
 
@@ -47,11 +104,28 @@ class OperationCancelled(Exception):
     pass
 
 
-def progress_callback(total_steps: int) -> Callable[[int], None]:
-    """Create a progress callback function for worker threads."""
+class _ProgressCallback:
+    """Maps step counts to percentages with integer math, emitting only on change."""
 
-    def _progress_update(current_step: int):
-        progress = min(int((current_step / total_steps) * 100), 100)
+    def __init__(self, total_steps: int, emit: Optional[Callable[[int], None]]):
+        self._total_steps = max(total_steps, 1)
+        self._emit = emit
+        self._last = None
+
+    def __call__(self, current_step: int) -> int:
+        progress = min(current_step * 100 // self._total_steps, 100)
+        if self._emit is not None and progress != self._last:
+            self._last = progress
+            self._emit(progress)
         return progress
 
-    return _progress_update
+
+def progress_callback(
+    total_steps: int, emit: Optional[Callable[[int], None]] = None
+) -> Callable[[int], int]:
+    """Create a progress callback function for worker threads.
+
+    The callback returns the percentage for a step; if emit is given (e.g. a
+    worker's progress.emit) it is called at most once per percentage point.
+    """
+    return _ProgressCallback(total_steps, emit)
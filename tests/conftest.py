@@ -0,0 +1,9 @@
+"""
+Shared pytest configuration for the test suite.
+"""
+
+import sys
+from pathlib import Path
+
+# Add src package to path once per session
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
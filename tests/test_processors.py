@@ -2,70 +2,76 @@
 Tests for the processor modules.
 """
 
+import os
+import tempfile
 import unittest
+from collections import namedtuple
+from types import SimpleNamespace
+import dask.array as da
 import numpy as np
+import pytest
+import tifffile
+import xarray as xr
 from unittest.mock import Mock, patch
 
-# Add src package to path
-import sys
-from pathlib import Path
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+# The worker classes need Qt; skip collection cleanly where it is unavailable
+pytest.importorskip("PySide6")
 
-from nd2_utils.processors.nd2_processor import ND2Processor
-from nd2_utils.processors.tiff_exporter import TiffExporter
+from nd2_utils.processors import nd2_processor
+from nd2_utils.processors.nd2_processor import build_ome_metadata, load_file
+from nd2_utils.processors.tiff_exporter import (
+    EXPORT_PASSTHROUGH_DTYPES,
+    _compression_kwargs,
+    export_to_tiff,
+    write_tiff_streaming,
+)
 from nd2_utils.utils.metadata import MetadataHandler
 from nd2_utils.utils.dimensions import DimensionParser
+from nd2_utils.utils.ranges import parse_range
+from nd2_utils.utils.threading import OperationCancelled, progress_callback
+
+
+class MockDataclass:
+    def __init__(self):
+        self.attr1 = "value1"
+        self.attr2 = "value2"
+
+
+MockNamedTuple = namedtuple('MockNamedTuple', ['attr1', 'attr2'])
+
+
+class MockPixelSize:
+    def __init__(self):
+        self.x = 0.1
+        self.y = 0.2
+        self.z = 0.5
+
+
+class MockPixelSizeAttrs:
+    def __init__(self):
+        self.pixelSizeUm = MockPixelSize()
 
 
 class TestMetadataHandler(unittest.TestCase):
     """Test the metadata handler utility."""
     
-    def test_convert_attrs_to_dict_dataclass(self):
-        """Test converting dataclass attributes to dict."""
-        class MockDataclass:
-            def __init__(self):
-                self.attr1 = "value1"
-                self.attr2 = "value2"
-        
-        mock_attrs = MockDataclass()
-        result = MetadataHandler.convert_attrs_to_dict(mock_attrs)
-        
+    def test_convert_attrs_to_dict(self):
+        """Test converting dataclass, namedtuple and dict attributes to dict."""
         expected = {"attr1": "value1", "attr2": "value2"}
-        self.assertEqual(result, expected)
-    
-    def test_convert_attrs_to_dict_namedtuple(self):
-        """Test converting namedtuple attributes to dict."""
-        from collections import namedtuple
-        MockNamedTuple = namedtuple('MockNamedTuple', ['attr1', 'attr2'])
-        mock_attrs = MockNamedTuple("value1", "value2")
+        cases = [
+            ("dataclass", MockDataclass()),
+            ("namedtuple", MockNamedTuple("value1", "value2")),
+            ("dict", {"attr1": "value1", "attr2": "value2"}),
+        ]
         
-        result = MetadataHandler.convert_attrs_to_dict(mock_attrs)
-        
-        expected = {"attr1": "value1", "attr2": "value2"}
-        self.assertEqual(result, expected)
-    
-    def test_convert_attrs_to_dict_dict(self):
-        """Test converting dict attributes to dict."""
-        mock_attrs = {"attr1": "value1", "attr2": "value2"}
-        
-        result = MetadataHandler.convert_attrs_to_dict(mock_attrs)
-        
-        expected = {"attr1": "value1", "attr2": "value2"}
-        self.assertEqual(result, expected)
+        for name, mock_attrs in cases:
+            with self.subTest(name=name):
+                result = MetadataHandler.convert_attrs_to_dict(mock_attrs)
+                self.assertEqual(result, expected)
     
     def test_extract_pixel_size(self):
         """Test extracting pixel size information."""
-        class MockPixelSize:
-            def __init__(self):
-                self.x = 0.1
-                self.y = 0.2
-                self.z = 0.5
-        
-        class MockAttrs:
-            def __init__(self):
-                self.pixelSizeUm = MockPixelSize()
-        
-        mock_attrs = MockAttrs()
+        mock_attrs = MockPixelSizeAttrs()
         result = MetadataHandler.extract_pixel_size(mock_attrs)
         
         expected = {"x": 0.1, "y": 0.2, "z": 0.5}
@@ -123,19 +129,18 @@ class TestDimensionParser(unittest.TestCase):
             'Z': {'size': 5}
         }
         
-        # Valid selections
-        result = DimensionParser.validate_dimension_selection(
-            dimensions, position=1, channel=2, time=5, z=3
-        )
-        expected = {'P': 1, 'C': 2, 'T': 5, 'Z': 3}
-        self.assertEqual(result, expected)
+        cases = [
+            # Valid selections
+            ("valid", dict(position=1, channel=2, time=5, z=3),
+             {'P': 1, 'C': 2, 'T': 5, 'Z': 3}),
+            # Invalid selections (out of range), should be empty
+            ("out of range", dict(position=5, channel=10, time=15, z=20), {}),
+        ]
         
-        # Invalid selections (out of range)
-        result = DimensionParser.validate_dimension_selection(
-            dimensions, position=5, channel=10, time=15, z=20
-        )
-        expected = {}  # All invalid, should be empty
-        self.assertEqual(result, expected)
+        for name, selection, expected in cases:
+            with self.subTest(name=name):
+                result = DimensionParser.validate_dimension_selection(dimensions, **selection)
+                self.assertEqual(result, expected)
     
     def test_ensure_5d_structure(self):
         """Test ensuring 5D structure for data."""
@@ -149,6 +154,29 @@ class TestDimensionParser(unittest.TestCase):
         result = DimensionParser.ensure_5d_structure(data_3d)
         self.assertEqual(result.shape, (1, 1, 4, 512, 512))
     
+    def test_select_5d(self):
+        """Test lazy 5D selection with ranges, single indices and missing axes."""
+        data = np.arange(4 * 3 * 2 * 5 * 6).reshape(4, 3, 2, 5, 6)
+        array = xr.DataArray(data, dims=['T', 'C', 'Z', 'Y', 'X'])
+        
+        result = DimensionParser.select_5d(array, {'T': (1, 2), 'C': 1, 'Z': 0})
+        
+        self.assertEqual(result.dims, ('T', 'P', 'C', 'Y', 'X'))
+        self.assertEqual(result.shape, (2, 1, 1, 5, 6))
+        np.testing.assert_array_equal(result.values[:, 0, 0], data[1:3, 1, 0])
+        
+        # Extra axes must be reduced to a single plane
+        with self.assertRaises(ValueError):
+            DimensionParser.select_5d(array, {'T': (1, 2)})
+        
+        # Out-of-range and reversed ranges are rejected instead of clamped
+        with self.assertRaisesRegex(ValueError, 'axis T'):
+            DimensionParser.select_5d(array, {'T': (0, 100), 'C': 1, 'Z': 0})
+        with self.assertRaisesRegex(ValueError, 'axis T'):
+            DimensionParser.select_5d(array, {'T': (3, 1), 'C': 1, 'Z': 0})
+        with self.assertRaisesRegex(ValueError, 'axis C'):
+            DimensionParser.select_5d(array, {'T': (1, 2), 'C': 3, 'Z': 0})
+    
     def test_get_dimension_limits(self):
         """Test getting dimension limits."""
         dimensions = {
@@ -162,25 +190,81 @@ class TestDimensionParser(unittest.TestCase):
         self.assertEqual(result, expected)
 
 
+class TestParseRange(unittest.TestCase):
+    """Test the range string parser."""
+    
+    def test_parse_single_value(self):
+        """Test parsing a single index."""
+        self.assertEqual(parse_range("3"), (3, 3))
+        self.assertEqual(parse_range(" 7 "), (7, 7))
+    
+    def test_parse_range(self):
+        """Test parsing an inclusive range."""
+        self.assertEqual(parse_range("0-4"), (0, 4))
+        self.assertEqual(parse_range(" 2 - 5 "), (2, 5))
+    
+    def test_parse_empty(self):
+        """Test that empty strings return None (full axis)."""
+        self.assertIsNone(parse_range(""))
+        self.assertIsNone(parse_range("  "))
+    
+    def test_parse_invalid(self):
+        """Test that malformed strings raise instead of selecting the full axis."""
+        for text in ("abc", "1-2-3", "-1", "5,7"):
+            with self.subTest(text=text), self.assertRaises(ValueError):
+                parse_range(text)
+
+
+class TestProgressCallback(unittest.TestCase):
+    """Test the worker progress callback."""
+    
+    def test_percentages(self):
+        """Test step to percentage mapping."""
+        callback = progress_callback(200)
+        self.assertEqual(callback(0), 0)
+        self.assertEqual(callback(99), 49)
+        self.assertEqual(callback(200), 100)
+        self.assertEqual(callback(250), 100)
+    
+    def test_emits_only_on_change(self):
+        """Test that emit is called once per percentage point."""
+        emitted = []
+        callback = progress_callback(1000, emitted.append)
+        for step in range(1001):
+            callback(step)
+        self.assertEqual(emitted, list(range(101)))
+
+
 class TestND2Processor(unittest.TestCase):
     """Test the ND2 processor."""
     
-    @patch('nd2_utils.processors.nd2_processor.nd2')
-    def test_load_file_success(self, mock_nd2):
+    @classmethod
+    def setUpClass(cls):
+        nd2_patch = patch.object(nd2_processor, 'nd2', autospec=True)
+        cls.mock_nd2 = nd2_patch.start()
+        cls.addClassCleanup(nd2_patch.stop)
+    
+    def setUp(self):
+        self.mock_nd2.reset_mock()
+    
+    def test_load_file_success(self):
         """Test successful file loading."""
+        mock_nd2 = self.mock_nd2
         # Setup mocks
-        mock_xarray = Mock()
-        mock_xarray.shape = (10, 3, 512, 512)
-        mock_xarray.size = 10 * 3 * 512 * 512
-        mock_xarray.dtype = 'uint16'
-        mock_xarray.dims = ['T', 'C', 'Y', 'X']
-        mock_xarray.attrs = {'metadata': {'attributes': {}}}
+        # Plain attribute stand-in; only nd2.imread needs call assertions
+        mock_xarray = SimpleNamespace(
+            shape=(10, 3, 512, 512),
+            size=10 * 3 * 512 * 512,
+            dtype='uint16',
+            dims=['T', 'C', 'Y', 'X'],
+            sizes={'T': 10, 'C': 3, 'Y': 512, 'X': 512},
+            attrs={'metadata': {'attributes': {}}},
+        )
         
         mock_nd2.imread.return_value = mock_xarray
         
         # Test loading
-        processor = ND2Processor()
-        result = processor.load_file("/test/file.nd2")
+        result = load_file("/test/file.nd2")
         
         # Verify result structure
         self.assertIn('path', result)
@@ -191,34 +275,166 @@ class TestND2Processor(unittest.TestCase):
         # Verify nd2.imread was called correctly
         mock_nd2.imread.assert_called_once_with("/test/file.nd2", xarray=True, dask=True)
     
+    def test_build_ome_metadata(self):
+        """Test building OME metadata from ND2 attributes."""
+        nd2_attrs = {
+            'pixelSizeUm': SimpleNamespace(x=0.1, y=0.2, z=None),
+            'channelNames': ('DAPI', 'GFP'),
+            'loops': [
+                SimpleNamespace(type='ZStackLoop'),
+                SimpleNamespace(type='TimeLoop', parameters=SimpleNamespace(periodMs=500)),
+            ],
+        }
+        
+        result = build_ome_metadata(nd2_attrs, "file.nd2")
+        
+        self.assertEqual(result['Description'], "Exported from ND2 file: file.nd2")
+        self.assertEqual(result['PhysicalSizeX'], 0.1)
+        self.assertEqual(result['PhysicalSizeY'], 0.2)
+        self.assertNotIn('PhysicalSizeZ', result)
+        self.assertEqual(result['Channel'], {'Name': ['DAPI', 'GFP']})
+        self.assertEqual(result['TimeIncrement'], 500)
+        
+        # Loops keyed by type
+        loops = {'TimeLoop': SimpleNamespace(parameters=SimpleNamespace(periodMs=250))}
+        result = build_ome_metadata({'loops': loops}, "file.nd2")
+        self.assertEqual(result['TimeIncrement'], 250)
+        
+        # Non-dict attributes only produce the description
+        self.assertEqual(list(build_ome_metadata(None, "file.nd2")), ['Description'])
 
 
 class TestTiffExporter(unittest.TestCase):
     """Test the TIFF exporter."""
     
-    @patch('nd2_utils.processors.tiff_exporter.tifffile')
-    @patch('nd2_utils.processors.tiff_exporter.nd2')
-    def test_export_file_success(self, mock_nd2, mock_tifffile):
+    @classmethod
+    def setUpClass(cls):
+        # The exporter loads through nd2_processor; files are written for real
+        nd2_patch = patch.object(nd2_processor, 'nd2', autospec=True)
+        cls.mock_nd2 = nd2_patch.start()
+        cls.addClassCleanup(nd2_patch.stop)
+    
+    def setUp(self):
+        self.mock_nd2.reset_mock()
+    
+    def test_export_file_success(self):
         """Test successful file export."""
-        # Setup mocks
-        mock_xarray = Mock()
-        mock_xarray.shape = (10, 1, 3, 512, 512)
-        mock_xarray.dims = ['T', 'P', 'C', 'Y', 'X']
-        mock_xarray.attrs = {'metadata': {'attributes': {}}}
-        mock_xarray.compute.return_value = np.ones((10, 1, 3, 512, 512), dtype=np.uint16)
+        mock_nd2 = self.mock_nd2
+        # Setup mocks; a zero-stride broadcast keeps the fake data allocation-free
+        data = np.broadcast_to(np.uint16(1), (10, 1, 3, 512, 512))
+        mock_nd2.imread.return_value = xr.DataArray(
+            da.from_array(data, chunks=(1, 1, 3, 512, 512)),
+            dims=['T', 'P', 'C', 'Y', 'X'],
+            attrs={'metadata': {'attributes': {}}},
+        )
         
-        mock_nd2.imread.return_value = mock_xarray
-        mock_tifffile.imwrite = Mock()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output_path = os.path.join(tmp_dir, 'output.ome.tif')
+            
+            # Test export
+            result = export_to_tiff("/test/input.nd2", output_path)
+            
+            # Verify result
+            self.assertEqual(result, output_path)
+            mock_nd2.imread.assert_called_once_with("/test/input.nd2", xarray=True, dask=True)
+            
+            # Verify the written planes
+            written = tifffile.imread(output_path)
+            self.assertEqual(written.shape, (10, 3, 512, 512))
+            self.assertTrue((written == 1).all())
+    
+    @staticmethod
+    def _dask_selection(data):
+        """Wrap a (T, P, C, Y, X) array as a dask-backed DataArray, one chunk per frame."""
+        t, p, c, y, x = data.shape
+        return xr.DataArray(
+            da.from_array(data, chunks=(1, 1, c, y, x)), dims=['T', 'P', 'C', 'Y', 'X']
+        )
+    
+    def test_write_tiff_streaming_round_trip(self):
+        """Test streamed planes read back in (T, P*C, Y, X) order."""
+        data = np.arange(3 * 2 * 4 * 5 * 6, dtype=np.uint16).reshape(3, 2, 4, 5, 6)
+        array = self._dask_selection(data)
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output_path = os.path.join(tmp_dir, 'out.ome.tif')
+            
+            write_tiff_streaming(output_path, array, {})
+            np.testing.assert_array_equal(
+                tifffile.imread(output_path), data.reshape(3, 2 * 4, 5, 6)
+            )
+            
+            # Sub-selections keep the same plane order
+            selection = DimensionParser.select_5d(array, {'T': (1, 2), 'P': (0, 1), 'C': (1, 3)})
+            write_tiff_streaming(output_path, selection, {})
+            np.testing.assert_array_equal(
+                tifffile.imread(output_path), data[1:3, 0:2, 1:4].reshape(2, 2 * 3, 5, 6)
+            )
+    
+    def test_write_tiff_streaming_float64(self):
+        """Test float64 scaling to uint16 and the source-dtype passthrough."""
+        data = np.linspace(0.0, 2.0, 2 * 2 * 3 * 4 * 4).reshape(2, 2, 3, 4, 4)
+        array = self._dask_selection(data)
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output_path = os.path.join(tmp_dir, 'out.ome.tif')
+            
+            write_tiff_streaming(output_path, array, {})
+            result = tifffile.imread(output_path)
+            self.assertEqual(result.dtype, np.uint16)
+            expected = np.round(data * (65535 / data.max())).astype(np.uint16)
+            np.testing.assert_allclose(result, expected.reshape(2, 2 * 3, 4, 4), atol=1)
+            
+            write_tiff_streaming(
+                output_path, array, {}, passthrough_dtypes=EXPORT_PASSTHROUGH_DTYPES
+            )
+            result = tifffile.imread(output_path)
+            self.assertEqual(result.dtype, np.float64)
+            np.testing.assert_array_equal(result, data.reshape(2, 2 * 3, 4, 4))
+    
+    def test_write_tiff_streaming_int32(self):
+        """Test that int32 is cast to uint16 even with the export_to_tiff passthrough."""
+        data = np.arange(2 * 2 * 3 * 4 * 4, dtype=np.int32).reshape(2, 2, 3, 4, 4)
+        array = self._dask_selection(data)
         
-        # Test export
-        exporter = TiffExporter()
-        result = exporter.export_file("/test/input.nd2", "/test/output.ome.tif")
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output_path = os.path.join(tmp_dir, 'out.ome.tif')
+            
+            write_tiff_streaming(
+                output_path, array, {}, passthrough_dtypes=EXPORT_PASSTHROUGH_DTYPES
+            )
+            result = tifffile.imread(output_path)
+            self.assertEqual(result.dtype, np.uint16)
+            np.testing.assert_array_equal(result, data.astype(np.uint16).reshape(2, 2 * 3, 4, 4))
+    
+    def test_write_tiff_streaming_removes_partial_file(self):
+        """Test that an aborted export leaves no truncated TIFF behind."""
+        data = np.ones((4, 2, 2, 5, 6), dtype=np.uint16)
+        
+        def on_plane(index, total):
+            if index == 3:
+                raise OperationCancelled("Operation was cancelled by user")
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output_path = os.path.join(tmp_dir, 'out.ome.tif')
+            with self.assertRaises(OperationCancelled):
+                write_tiff_streaming(
+                    output_path, self._dask_selection(data), {}, on_plane=on_plane
+                )
+            self.assertFalse(os.path.exists(output_path))
+    
+    def test_compression_kwargs(self):
+        """Test tifffile compression arguments per dtype and codec."""
+        kwargs = _compression_kwargs(np.uint16, "zlib")
+        self.assertEqual(kwargs['compression'], "zlib")
+        self.assertEqual(kwargs['predictor'], 2)
+        self.assertIn('compressionargs', kwargs)
         
-        # Verify result
-        self.assertEqual(result, "/test/output.ome.tif")
+        # No integer predictor for float data
+        self.assertIsNone(_compression_kwargs(np.float32, "zlib")['predictor'])
         
-        # Verify tifffile.imwrite was called
-        mock_tifffile.imwrite.assert_called_once()
+        # Compression can be switched off
+        self.assertEqual(_compression_kwargs(np.uint16, None), {})
 
 
 if __name__ == '__main__':